@@ -1,15 +1,23 @@
 # ABOUTME: PydanticAI agent configuration
 # ABOUTME: Sets up Claude agent with message fetching capabilities
 
+import hashlib
+import re
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+
+from cachetools import TTLCache
 from pydantic_ai import Agent, RunContext
 from pydantic_ai.models.anthropic import AnthropicModel
 from pydantic_ai.providers.anthropic import AnthropicProvider
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel
 from typing import List, Optional
 import discord
 from config import get_settings
 from tools import fetch_messages_tool, FetchMessagesParams, MessageData
 from conversation import ChannelConversation
+from utils import MENTION_RE
 
 
 class AgentContext(BaseModel):
@@ -23,13 +31,82 @@ class AgentContext(BaseModel):
     recent_messages: Optional[List[MessageData]] = None
 
 
-class AgentDependencies(BaseModel):
-    """Dependencies injected into agent tools."""
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+# Bind the schema-specialized serializer once instead of going through
+# the model_dump_json wrapper on every request
+_CTX_TO_JSON = AgentContext.__pydantic_serializer__.to_json
+
 
+@dataclass(slots=True, frozen=True)
+class AgentDependencies:
+    """Dependencies injected into agent tools."""
     discord_client: discord.Client
 
 
+# Questions containing time-relative words go stale immediately, so they
+# always bypass the response cache.
+_TIME_SENSITIVE_RE = re.compile(
+    r'\b(now|today|tonight|yesterday|currently|right now)\b',
+    re.IGNORECASE
+)
+
+# Lazy singleton cache for agent responses (TTL from settings)
+_response_cache = None
+
+
+def _get_response_cache() -> TTLCache:
+    """Get or create the TTL cache for agent responses."""
+    global _response_cache
+    if _response_cache is None:
+        settings = get_settings()
+        _response_cache = TTLCache(maxsize=512, ttl=settings.llm_cache_ttl)
+    return _response_cache
+
+
+def _response_cache_key(
+    question: str,
+    channel_id: int,
+    server_id: int,
+    recent_messages: Optional[List[MessageData]]
+) -> bytes:
+    """
+    Build a cache key from the question and the channel state.
+
+    Including a digest of the recent messages means any new activity in
+    the channel naturally invalidates stale entries. Occurrences of the
+    question itself are skipped: on_message records the triggering
+    message before the agent runs, so a repeated question would
+    otherwise always digest its own earlier asks and never produce the
+    same key twice.
+    """
+    normalized_question = question.strip().lower()
+    digest = hashlib.blake2b()
+    digest.update(normalized_question.encode())
+    digest.update(channel_id.to_bytes(8, 'big'))
+    digest.update(server_id.to_bytes(8, 'big'))
+    for msg in recent_messages or []:
+        content = msg.content
+        # Recorded asks carry the raw mention; strip it before comparing
+        if MENTION_RE.sub('', content).strip().lower() == normalized_question:
+            continue
+        digest.update(content.encode())
+    return digest.digest()
+
+
+# Per-guild {lowercased channel name: channel id} index so get_channel_id
+# doesn't linearly scan guild.channels on every tool call. The short TTL
+# plus rebuild-on-miss keeps it tolerant of channel renames/creates.
+_channel_index: TTLCache = TTLCache(maxsize=64, ttl=300)
+
+
+def _build_channel_index(guild: discord.Guild) -> dict[str, int]:
+    """Build the name -> id lookup for a guild's text channels."""
+    return {
+        ch.name.lower(): ch.id
+        for ch in guild.channels
+        if isinstance(ch, discord.TextChannel)
+    }
+
+
 # System prompt for the agent
 SYSTEM_PROMPT = """You are a helpful productivity assistant for a Discord server.
 
@@ -57,11 +134,23 @@ Guidelines:
 - When a user specifies a different channel by name, use get_channel_id with the channel_name and server_id from context
 - Keep responses focused and relevant to the question"""
 
+# The prompt never changes; intern it so identity checks and dict lookups
+# on it downstream are pointer comparisons
+SYSTEM_PROMPT = sys.intern(SYSTEM_PROMPT)
+
 
+@lru_cache(maxsize=1)
 def create_productivity_agent() -> Agent:
-    """Create and return the productivity agent instance."""
+    """
+    Create and return the productivity agent instance.
+
+    Cached so the provider, model, and tool registrations are built once
+    rather than on every incoming message.
+    """
     settings = get_settings()
 
+    # The factory is cached, so the provider's default pooled client is
+    # shared by every Claude call for the life of the process
     provider = AnthropicProvider(api_key=settings.anthropic_api_key)
     agent = Agent(
         model=AnthropicModel(
@@ -69,8 +158,7 @@ def create_productivity_agent() -> Agent:
             provider=provider
         ),
         system_prompt=SYSTEM_PROMPT,
-        deps_type=AgentDependencies,
-        instrument=True
+        deps_type=AgentDependencies
     )
 
     @agent.tool
@@ -96,17 +184,23 @@ def create_productivity_agent() -> Agent:
         if not guild:
             raise ValueError(f"Server {server_id} not found or not accessible")
 
-        # Search for channel with case-insensitive matching
-        channel = None
-        for ch in guild.channels:
-            if isinstance(ch, discord.TextChannel) and ch.name.lower() == channel_name.lower():
-                channel = ch
-                break
+        # O(1) case-insensitive lookup against the cached index
+        index = _channel_index.get(server_id)
+        if index is None:
+            index = _build_channel_index(guild)
+            _channel_index[server_id] = index
 
-        if not channel:
+        channel_id = index.get(channel_name.lower())
+        if channel_id is None:
+            # The index may be stale (channel created/renamed); rebuild once
+            index = _build_channel_index(guild)
+            _channel_index[server_id] = index
+            channel_id = index.get(channel_name.lower())
+
+        if channel_id is None:
             raise ValueError(f"Channel '{channel_name}' not found in server")
 
-        return channel.id
+        return channel_id
 
     @agent.tool
     async def fetch_messages(
@@ -140,6 +234,29 @@ def create_productivity_agent() -> Agent:
     return agent
 
 
+def _build_agent_context(
+    question: str,
+    channel: discord.TextChannel,
+    user: discord.User,
+    recent_messages: Optional[List[MessageData]]
+) -> AgentContext:
+    """
+    Assemble the per-question context object.
+
+    model_construct skips validation; safe here because every field
+    comes straight from Discord objects we just read.
+    """
+    return AgentContext.model_construct(
+        question=question,
+        channel_id=channel.id,
+        channel_name=channel.name,
+        server_id=channel.guild.id,
+        server_name=channel.guild.name,
+        user_name=user.display_name,
+        recent_messages=recent_messages if recent_messages else None,
+    )
+
+
 async def run_agent(
     question: str,
     channel: discord.TextChannel,
@@ -160,25 +277,28 @@ async def run_agent(
     Returns:
         Tuple of (agent response string, new messages list)
     """
-    # Use conversation's accumulated messages
-    recent_messages = conversation.messages
+    # Use conversation's accumulated messages (snapshot the deque as a
+    # list so serialization sees a stable sequence)
+    recent_messages = list(conversation.messages)
+
+    # Check the response cache unless the question is time-sensitive
+    cache_key = None
+    if not _TIME_SENSITIVE_RE.search(question):
+        cache_key = _response_cache_key(
+            question, channel.id, channel.guild.id, recent_messages
+        )
+        cached_output = _get_response_cache().get(cache_key)
+        if cached_output is not None:
+            return cached_output, []
 
-    context = AgentContext(
-        question=question,
-        channel_id=channel.id,
-        channel_name=channel.name,
-        server_id=channel.guild.id,
-        server_name=channel.guild.name,
-        user_name=user.display_name,
-        recent_messages=recent_messages if recent_messages else None,
-    )
+    context = _build_agent_context(question, channel, user, recent_messages)
 
     dependencies = AgentDependencies(discord_client=discord_client)
 
     agent = create_productivity_agent()
 
-    # Serialize context to JSON
-    context_json = context.model_dump_json()
+    # Serialize context to JSON via the prebound serializer
+    context_json = _CTX_TO_JSON(context).decode()
 
     # Use conversation's LLM history
     message_history = conversation.llm_history
@@ -192,4 +312,7 @@ async def run_agent(
     # Get new messages from this run for conversation history
     new_messages = result.new_messages()
 
+    if cache_key is not None:
+        _get_response_cache()[cache_key] = result.output
+
     return result.output, new_messages
@@ -5,18 +5,17 @@
 from dotenv import load_dotenv
 load_dotenv()
 
-import os
 import asyncio
+import logging
 from typing import Optional
 import discord
 from discord import Message
 from config import get_settings
 from agent import run_agent
-from utils import chunk_message
+from utils import MENTION_RE, chunk_message
 from instrumentation import initialize_instrumentation
-from conversation import ConversationManager, ResponseDecider
+from conversation import ChannelConversation, ConversationManager, ResponseDecider
 from tools import MessageData, fetch_messages_tool, FetchMessagesParams
-from datetime import datetime, timezone
 
 intents = discord.Intents.default()
 intents.message_content = True
@@ -24,10 +23,28 @@ intents.guilds = True
 
 client = discord.Client(intents=intents)
 
-# Initialize conversation management
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUESTION = (
+    "What is the user asking about based on the recent messages in this channel? "
+    "Please infer the question from the conversation context."
+)
+
+
+def extract_question(message: Message) -> str:
+    """Strip bot mentions from a message, falling back to an inference prompt."""
+    question = MENTION_RE.sub('', message.content).strip()
+    return question if question else DEFAULT_QUESTION
+
+# Settings are read once at import (after load_dotenv) and shared by the
+# per-message helpers below
 settings = get_settings()
+
+# Initialize conversation management
 conversation_manager = ConversationManager(
-    timeout_seconds=settings.conversation_timeout_seconds
+    timeout_seconds=settings.conversation_timeout_seconds,
+    max_messages=settings.conversation_message_cap,
+    max_lifetime_seconds=settings.conversation_max_lifetime_seconds
 )
 response_decider = ResponseDecider(
     followup_window_seconds=settings.followup_window_seconds
@@ -37,8 +54,32 @@ response_decider = ResponseDecider(
 @client.event
 async def on_ready():
     """Called when bot successfully connects to Discord."""
-    print(f'{client.user} has connected to Discord!')
-    print(f'Bot is in {len(client.guilds)} guilds')
+    logger.info('%s has connected to Discord!', client.user)
+    logger.info('Bot is in %d guilds', len(client.guilds))
+
+
+# Resolved debug channel ids, keyed by (guild id, channel name) so a
+# config change naturally misses the old entries
+_debug_channel_ids: dict[tuple, int] = {}
+
+
+def _get_debug_channel(guild, name: str):
+    """Resolve the debug channel, scanning the guild's channels only on a miss."""
+    key = (guild.id, name)
+    cached_id = _debug_channel_ids.get(key)
+    if cached_id is not None:
+        channel = guild.get_channel(cached_id)
+        # get_channel resolves by id, so a renamed channel still comes
+        # back; verify the name to avoid logging to it forever
+        if channel is not None and channel.name == name:
+            return channel
+        # Channel was deleted or renamed; fall through and re-scan
+        del _debug_channel_ids[key]
+
+    channel = discord.utils.get(guild.text_channels, name=name)
+    if channel is not None:
+        _debug_channel_ids[key] = channel.id
+    return channel
 
 
 async def send_error_message(
@@ -56,27 +97,33 @@ async def send_error_message(
     """
     await message.channel.send(f"Sorry, {error_text}")
 
-    settings = get_settings()
-    if log_error and settings.debug_channel_name:
+    # Error path is cold, so re-reading settings here is fine and keeps
+    # debug-channel configuration changes visible
+    error_settings = get_settings()
+    if log_error and error_settings.debug_channel_name:
         if isinstance(message.channel, discord.TextChannel) and message.channel.guild:
-            debug_channel = discord.utils.get(
-                message.channel.guild.text_channels,
-                name=settings.debug_channel_name
+            debug_channel = _get_debug_channel(
+                message.channel.guild,
+                error_settings.debug_channel_name
             )
             if debug_channel:
                 await debug_channel.send(f"Error in {message.channel.mention}:\n```\n{log_error}\n```")
 
 
-async def send_chunked_response(channel: discord.TextChannel, response: str):
+async def send_chunked_response(
+    channel: discord.TextChannel,
+    response: str,
+    max_length: int = settings.max_response_length
+):
     """
     Send response to Discord, chunking if necessary.
 
     Args:
         channel: Channel to send to
         response: Response text to send
+        max_length: Maximum chunk length (bound from settings at import)
     """
-    settings = get_settings()
-    chunks = chunk_message(response, max_length=settings.max_response_length)
+    chunks = chunk_message(response, max_length=max_length)
 
     for chunk in chunks:
         await channel.send(chunk)
@@ -84,6 +131,63 @@ async def send_chunked_response(channel: discord.TextChannel, response: str):
 
 
 
+async def _handle_question(
+    message: Message,
+    channel_id: int,
+    conversation: ChannelConversation
+):
+    """
+    Run the agent for a message and deliver the response.
+
+    Shared by both on_message branches (active conversation and newly
+    started conversation). Handles the typing indicator, response
+    chunking, conversation history updates, and error reporting.
+    """
+    # Extract question (remove bot mention if present)
+    question = extract_question(message)
+
+    try:
+        # Show typing only while the agent is thinking; discord.py's
+        # typing() context manager runs its own keepalive task, and the
+        # indicator clears as soon as the bot sends a message
+        async with message.channel.typing():
+            # Run the AI agent with conversation context
+            response, new_messages = await run_agent(
+                question=question,
+                channel=message.channel,
+                user=message.author,
+                discord_client=client,
+                conversation=conversation
+            )
+
+        # Record bot response in conversation before the Discord
+        # round trips, so history bookkeeping is off the send path;
+        # record_bot_response extends the existing history in place
+        conversation_manager.record_bot_response(channel_id, new_messages)
+
+        # Send response (chunked if needed)
+        await send_chunked_response(message.channel, response)
+
+    except ValueError as e:
+        await send_error_message(
+            message,
+            error_text=str(e),
+            log_error=f"ValueError: {e}\nQuestion: {question}\nUser: {message.author}"
+        )
+
+    except Exception as e:
+        error_msg = f"I encountered an error processing your question."
+        log_msg = f"Unexpected error:\n{type(e).__name__}: {e}\nQuestion: {question}\nUser: {message.author}"
+
+        await send_error_message(
+            message,
+            error_text=error_msg,
+            log_error=log_msg
+        )
+
+        logger.exception("Error processing question")
+
+
 @client.event
 async def on_message(message: Message):
     """
@@ -94,8 +198,11 @@ async def on_message(message: Message):
     2. Check for active conversation or should start one
     3. Record message and decide if bot should respond
     """
+    # Fetch client.user once; it's behind a property and read twice below
+    bot_user = client.user
+
     # Filter out bot's own messages before any processing
-    if message.author == client.user:
+    if message.author == bot_user:
         return
 
     # Verify we're in a text channel
@@ -103,15 +210,24 @@ async def on_message(message: Message):
         return
 
     channel_id = message.channel.id
-    bot_user_id = client.user.id if client.user else 0
+    bot_user_id = bot_user.id if bot_user else 0
 
     # Check if there's an active conversation
     conversation = conversation_manager.get(channel_id)
-    print(f"Conversation: {conversation}")
+    logger.debug("Conversation: %s", conversation)
     if conversation:
-        print(f"Active conversation found in channel: {message.channel.name}")
-        # Active conversation exists - record message and check if should respond
-        message_data = MessageData(
+        logger.debug("Active conversation found in channel: %s", message.channel.name)
+        # Decide first - should_respond only needs the raw message and
+        # conversation timestamps, not the recorded MessageData
+        should_respond, reason = response_decider.should_respond(
+            message, conversation, bot_user_id
+        )
+        logger.debug("should_respond: %s, reason: %s", should_respond, reason)
+
+        # Record every message regardless of the decision: the accumulated
+        # messages are the prompt context for later questions
+        # Fields come straight from the Discord message; skip validation
+        message_data = MessageData.model_construct(
             author=message.author.display_name,
             author_id=message.author.id,
             content=message.content,
@@ -120,143 +236,45 @@ async def on_message(message: Message):
         )
         conversation_manager.record_message(channel_id, message_data)
 
-        should_respond, reason = response_decider.should_respond(
-            message, conversation, bot_user_id
-        )
-        print(f"should_respond: {should_respond}, reason: {reason}")
-
         if should_respond:
-            # Extract question (remove bot mention if present)
-            question = message.content
-            for mention in message.mentions:
-                question = question.replace(f'<@{mention.id}>', '').replace(f'<@!{mention.id}>', '')
-            question = question.strip()
-
-            if not question:
-                question = "What is the user asking about based on the recent messages in this channel? Please infer the question from the conversation context."
-
-            # Show typing indicator while processing
-            async with message.channel.typing():
-                try:
-                    # Run the AI agent with conversation context
-                    response, new_messages = await run_agent(
-                        question=question,
-                        channel=message.channel,
-                        user=message.author,
-                        discord_client=client,
-                        conversation=conversation
-                    )
-
-                    # Send response (chunked if needed)
-                    await send_chunked_response(message.channel, response)
-
-                    # Record bot response in conversation
-                    # Append new messages to existing history
-                    updated_history = conversation.llm_history + new_messages
-                    conversation_manager.record_bot_response(channel_id, updated_history)
-
-                except ValueError as e:
-                    await send_error_message(
-                        message,
-                        error_text=str(e),
-                        log_error=f"ValueError: {e}\nQuestion: {question}\nUser: {message.author}"
-                    )
-
-                except Exception as e:
-                    error_msg = f"I encountered an error processing your question."
-                    log_msg = f"Unexpected error:\n{type(e).__name__}: {e}\nQuestion: {question}\nUser: {message.author}"
-
-                    await send_error_message(
-                        message,
-                        error_text=error_msg,
-                        log_error=log_msg
-                    )
-
-                    print(f"Error: {e}")
-                    import traceback
-                    traceback.print_exc()
+            await _handle_question(message, channel_id, conversation)
     else:
         # No active conversation - check if should start one
         should_start, reason = response_decider.should_start_conversation(
             message, bot_user_id
         )
-        print(f"should_start_conversation: {should_start}, reason: {reason}")
+        logger.debug("should_start_conversation: %s, reason: %s", should_start, reason)
 
         if should_start:
             # Load recent messages and start conversation
             # Use fetch_messages_tool with a short time window (1 hour) to get recent context
-            try:
-                params = FetchMessagesParams(
-                    channel_id=channel_id,
-                    hours_back=1,  # Last hour for conversation context
-                    limit=20  # Reasonable limit for initial context
-                )
-                recent_messages = await fetch_messages_tool(params, client)
-            except Exception:
-                # Graceful degradation: start with empty messages
-                recent_messages = []
+            params = FetchMessagesParams(
+                channel_id=channel_id,
+                hours_back=1,  # Last hour for conversation context
+                limit=20  # Reasonable limit for initial context
+            )
+            # Kick off the REST fetch and do local work while it's in flight
+            fetch_task = asyncio.create_task(fetch_messages_tool(params, client))
 
-            # Add current message
-            message_data = MessageData(
+            # Add current message (fields come straight from Discord; skip validation)
+            message_data = MessageData.model_construct(
                 author=message.author.display_name,
                 author_id=message.author.id,
                 content=message.content,
                 timestamp=message.created_at,
                 is_bot=message.author.bot
             )
+
+            try:
+                recent_messages = await fetch_task
+            except Exception:
+                # Graceful degradation: start with empty messages
+                recent_messages = []
             recent_messages.append(message_data)
 
             conversation = conversation_manager.start(channel_id, recent_messages)
-            print(f"Conversation started in channel: {message.channel.name}")
-            # Extract question (remove bot mention if present)
-            question = message.content
-            for mention in message.mentions:
-                question = question.replace(f'<@{mention.id}>', '').replace(f'<@!{mention.id}>', '')
-            question = question.strip()
-
-            if not question:
-                question = "What is the user asking about based on the recent messages in this channel? Please infer the question from the conversation context."
-
-            # Show typing indicator while processing
-            async with message.channel.typing():
-                try:
-                    # Run the AI agent with conversation context
-                    response, new_messages = await run_agent(
-                        question=question,
-                        channel=message.channel,
-                        user=message.author,
-                        discord_client=client,
-                        conversation=conversation
-                    )
-
-                    # Send response (chunked if needed)
-                    await send_chunked_response(message.channel, response)
-
-                    # Record bot response in conversation
-                    # Append new messages to existing history
-                    updated_history = conversation.llm_history + new_messages
-                    conversation_manager.record_bot_response(channel_id, updated_history)
-
-                except ValueError as e:
-                    await send_error_message(
-                        message,
-                        error_text=str(e),
-                        log_error=f"ValueError: {e}\nQuestion: {question}\nUser: {message.author}"
-                    )
-
-                except Exception as e:
-                    error_msg = f"I encountered an error processing your question."
-                    log_msg = f"Unexpected error:\n{type(e).__name__}: {e}\nQuestion: {question}\nUser: {message.author}"
-
-                    await send_error_message(
-                        message,
-                        error_text=error_msg,
-                        log_error=log_msg
-                    )
-
-                    print(f"Error: {e}")
-                    import traceback
-                    traceback.print_exc()
+            logger.info("Conversation started in channel: %s", message.channel.name)
+            await _handle_question(message, channel_id, conversation)
         else:
             # No trigger to start conversation - just record message if conversation exists
             # (This shouldn't happen since we checked for active conversation above,
@@ -271,10 +289,19 @@ def main():
     if not token:
         raise ValueError('DISCORD_TOKEN not found in environment variables')
 
+    # Use uvloop's libuv event loop when available (not on Windows);
+    # discord.py runs on standard asyncio so no other changes are needed
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     # Initialize OpenTelemetry instrumentation for Langfuse
     initialize_instrumentation(settings)
 
-    print("Starting Discord bot...")
+    logging.basicConfig(level=logging.INFO)
+    logger.info("Starting Discord bot...")
     client.run(token)
 
 
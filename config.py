@@ -1,6 +1,8 @@
 # ABOUTME: Application configuration using pydantic-settings
 # ABOUTME: Loads settings from environment variables and .env file
 
+from functools import cached_property
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
@@ -20,8 +22,14 @@ class Settings(BaseSettings):
     recent_context_minutes: int = 5
     recent_context_limit: int = 10
 
+    # Response cache settings
+    llm_cache_ttl: int = 300  # Seconds before cached agent responses expire
+    message_fetch_cache_ttl: int = 5  # Seconds to reuse fetched channel history
+
     # Conversation settings
     conversation_timeout_seconds: int = 120
+    conversation_message_cap: int = 200  # Max messages retained per conversation
+    conversation_max_lifetime_seconds: int = 3600  # Absolute cap from conversation start
     followup_window_seconds: int = 60  # How long after bot speaks to consider followups
 
     # Langfuse observability settings (optional)
@@ -29,6 +37,11 @@ class Settings(BaseSettings):
     langfuse_secret_key: Optional[str] = None
     langfuse_host: str = "https://us.cloud.langfuse.com"
 
+    @cached_property
+    def langfuse_configured(self) -> bool:
+        """Whether both Langfuse keys are set; computed once per instance."""
+        return bool(self.langfuse_public_key and self.langfuse_secret_key)
+
     model_config = SettingsConfigDict(
         env_file='.env',
         env_file_encoding='utf-8',
@@ -1,23 +1,52 @@
 # ABOUTME: Channel-based conversation tracking system
 # ABOUTME: Manages active conversations per channel with timeout and response decisions
 
+import heapq
+import re
+import time
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Callable, Optional, Sequence
 import discord
 from pydantic_ai import ModelMessage
 from tools import MessageData
 
+# Hoisted so hot paths skip the datetime/timezone global+attribute
+# lookups on every call
+_UTC = timezone.utc
+_dt_now = datetime.now
 
-@dataclass
+# A burst of Discord events lands within the same few milliseconds; share
+# one wall-clock reading across them instead of building a fresh datetime
+# per call. Tolerance is far below the second-scale timeouts used here.
+_NOW_TOLERANCE_SECONDS = 0.05
+_cached_now: Optional[tuple[float, datetime]] = None
+
+
+def _utc_now() -> datetime:
+    """Current UTC time, reusing a reading taken within the last 50ms."""
+    global _cached_now
+    mono = time.monotonic()
+    cached = _cached_now
+    if cached is not None and mono - cached[0] < _NOW_TOLERANCE_SECONDS:
+        return cached[1]
+    now = _dt_now(_UTC)
+    _cached_now = (mono, now)
+    return now
+
+
+@dataclass(slots=True)
 class ChannelConversation:
     """State for an active conversation in a channel."""
     channel_id: int
     started_at: datetime
     last_activity: datetime
 
-    # All messages seen during conversation - full channel context for prompt building
-    messages: list[MessageData] = field(default_factory=list)
+    # Messages seen during conversation - channel context for prompt building.
+    # Bounded (see ConversationManager.max_messages) so long-lived
+    # conversations drop their oldest context instead of growing forever.
+    messages: deque[MessageData] = field(default_factory=deque)
 
     # Bot's conversation turns only (user question → bot response pairs)
     # Passed to PydanticAI's message_history for conversation continuity
@@ -33,9 +62,53 @@ class ChannelConversation:
 class ConversationManager:
     """Manages active conversations per channel."""
     
-    def __init__(self, timeout_seconds: int = 120):
+    def __init__(
+        self,
+        timeout_seconds: int = 120,
+        max_messages: int = 200,
+        max_lifetime_seconds: Optional[int] = None,
+        clock: Callable[[], datetime] = _utc_now
+    ):
         self.timeout = timeout_seconds
+        self.max_messages = max_messages
+        # Absolute cap measured from started_at: a continuously active
+        # channel otherwise keeps one conversation (and its LLM history)
+        # alive forever. None disables the cap.
+        self.max_lifetime = max_lifetime_seconds
+        # Injectable clock so tests can advance time without sleeping
+        self._clock = clock
         self._conversations: dict[int, ChannelConversation] = {}
+        # Min-heap of (expiry timestamp, channel_id) so idle conversations
+        # are evicted even if nothing ever calls get() for their channel.
+        # Entries go stale when a conversation is bumped; the sweep skips
+        # them by re-checking the conversation's actual last_activity.
+        self._expiry_heap: list[tuple[float, int]] = []
+
+    def _push_expiry(self, conv: ChannelConversation):
+        """Record a conversation's current expiry time on the heap."""
+        heapq.heappush(
+            self._expiry_heap,
+            (conv.last_activity.timestamp() + self.timeout, conv.channel_id)
+        )
+
+    def _sweep(self, now: datetime, max_pops: int = 8):
+        """
+        Lazily drop conversations whose expiry has passed, O(log n) each.
+
+        Bounded to max_pops heap entries per call so a large backlog of
+        stale entries is amortized across events rather than stalling one.
+        """
+        now_ts = now.timestamp()
+        heap = self._expiry_heap
+        while max_pops > 0 and heap and heap[0][0] <= now_ts:
+            max_pops -= 1
+            _, channel_id = heapq.heappop(heap)
+            conv = self._conversations.get(channel_id)
+            if conv is None:
+                continue
+            if conv.last_activity.timestamp() + self.timeout <= now_ts:
+                del self._conversations[channel_id]
+            # Otherwise the entry was stale; a fresher one is still queued
 
     def get(self, channel_id: int) -> Optional[ChannelConversation]:
         """
@@ -47,14 +120,22 @@ class ConversationManager:
         if conv is None:
             return None
         
-        # Check if expired
-        now = datetime.now(timezone.utc)
+        # Check if expired: the sliding inactivity timeout, then the
+        # absolute lifetime cap
+        now = self._clock()
         elapsed = (now - conv.last_activity).total_seconds()
         if elapsed > self.timeout:
             # Remove expired conversation
             del self._conversations[channel_id]
             return None
-        
+
+        if (
+            self.max_lifetime is not None
+            and (now - conv.started_at).total_seconds() > self.max_lifetime
+        ):
+            del self._conversations[channel_id]
+            return None
+
         return conv
 
     def start(
@@ -63,19 +144,22 @@ class ConversationManager:
         initial_messages: list[MessageData]
     ) -> ChannelConversation:
         """Start a new conversation in a channel."""
-        now = datetime.now(timezone.utc)
+        now = self._clock()
         conv = ChannelConversation(
             channel_id=channel_id,
             started_at=now,
             last_activity=now,
-            messages=initial_messages.copy() if initial_messages else []
+            # deque construction copies, so no separate .copy() is needed;
+            # maxlen drops the oldest record in O(1) once the cap is hit
+            messages=deque(initial_messages or (), maxlen=self.max_messages)
         )
         
         # Add participants from initial messages
-        for msg in initial_messages:
-            conv.participants.add(msg.author_id)
-        
+        conv.participants.update(msg.author_id for msg in initial_messages)
+
         self._conversations[channel_id] = conv
+        self._push_expiry(conv)
+        self._sweep(now)
         return conv
 
     def record_message(self, channel_id: int, message: MessageData):
@@ -89,31 +173,55 @@ class ConversationManager:
             return
         
         # Update last_activity
-        conv.last_activity = datetime.now(timezone.utc)
-        
+        conv.last_activity = self._clock()
+
         # Add message
         conv.messages.append(message)
-        
+
         # Add participant
         conv.participants.add(message.author_id)
 
+        self._push_expiry(conv)
+        self._sweep(conv.last_activity)
+
+    def record_messages(self, channel_id: int, messages: Sequence[MessageData]):
+        """
+        Record a batch of messages in one pass.
+
+        Bulk counterpart to record_message for ingesting message bursts:
+        last_activity is written once and the message window is extended
+        with a single C-level call instead of N appends.
+        """
+        if not messages:
+            return
+        conv = self._conversations.get(channel_id)
+        if conv is None:
+            return
+
+        conv.last_activity = self._clock()
+        conv.messages.extend(messages)
+        conv.participants.update(msg.author_id for msg in messages)
+
+        self._push_expiry(conv)
+        self._sweep(conv.last_activity)
+
     def record_bot_response(
         self,
         channel_id: int,
-        llm_history: list[ModelMessage]
+        new_messages: list[ModelMessage]
     ):
         """
-        Record bot's response in the conversation's LLM history.
-        
-        This maintains conversation continuity for the LLM.
-        Also updates last_bot_response timestamp.
+        Append the latest turn's messages to the conversation's LLM history.
+
+        Extends the existing history in place rather than rebuilding the
+        list each turn. Also updates last_bot_response timestamp.
         """
         conv = self._conversations.get(channel_id)
         if conv is None:
             return
-        
-        conv.llm_history = llm_history
-        conv.last_bot_response = datetime.now(timezone.utc)
+
+        conv.llm_history.extend(new_messages)
+        conv.last_bot_response = self._clock()
 
     def end(self, channel_id: int):
         """End a conversation in a channel."""
@@ -122,7 +230,15 @@ class ConversationManager:
 
 class ResponseDecider:
     """Decides when to start conversations and when to respond."""
-    
+
+    # Continuation words that suggest a follow-up. A precompiled
+    # case-insensitive prefix match avoids lowercasing the whole message
+    # just to compare its first word or two.
+    _FOLLOWUP_RE = re.compile(
+        r'^(?:and|also|what about|how about|why|but)\s',
+        re.IGNORECASE
+    )
+
     def __init__(self, followup_window_seconds: int = 60):
         """
         Initialize ResponseDecider.
@@ -132,21 +248,39 @@ class ResponseDecider:
         """
         self.followup_window_seconds = followup_window_seconds
     
+    def _mentions_bot(
+        self,
+        message: discord.Message,
+        bot_user_id: int
+    ) -> bool:
+        """Check if the bot is @mentioned, without building a throwaway list."""
+        return any(m.id == bot_user_id for m in message.mentions)
+
+    def _is_reply_to_bot(
+        self,
+        message: discord.Message,
+        bot_user_id: int
+    ) -> bool:
+        """Check if the message is a reply to one of the bot's messages."""
+        # Bind the reference chain once instead of re-walking the
+        # attribute lookups for each check
+        ref = message.reference
+        resolved = ref.resolved if ref else None
+        return (
+            isinstance(resolved, discord.Message)
+            and resolved.author.id == bot_user_id
+        )
+
     def _is_explicit_trigger(
         self,
         message: discord.Message,
         bot_user_id: int
     ) -> bool:
         """Check if message has explicit trigger (@mention or reply to bot)."""
-        if bot_user_id in [m.id for m in message.mentions]:
-            return True
-        
-        if message.reference and message.reference.resolved:
-            referenced = message.reference.resolved
-            if isinstance(referenced, discord.Message) and referenced.author.id == bot_user_id:
-                return True
-        
-        return False
+        return (
+            self._mentions_bot(message, bot_user_id)
+            or self._is_reply_to_bot(message, bot_user_id)
+        )
     
     def _seconds_since_bot_spoke(
         self,
@@ -161,7 +295,7 @@ class ResponseDecider:
         if conversation.last_bot_response is None:
             return None
         
-        now = datetime.now(timezone.utc)
+        now = _utc_now()
         elapsed = (now - conversation.last_bot_response).total_seconds()
         return elapsed
     
@@ -173,18 +307,19 @@ class ResponseDecider:
         - Short messages with question marks
         - Continuation words at start
         """
-        content = message.content.lower()
-        
-        # Short messages with question marks
-        if len(content.split()) < 10 and "?" in content:
+        # Neither check needs a lowercased copy of the message: the
+        # question-mark test is case-free and the starter regex matches
+        # case-insensitively against the original string.
+        content = message.content
+
+        # Short messages with question marks. Counting spaces stands in
+        # for the word count without allocating split()'s token list, and
+        # the "?" membership test runs first since it fails cheapest.
+        if "?" in content and content.count(" ") < 9:
             return True
-        
+
         # Continuation words
-        starters = ["and ", "also ", "what about ", "how about ", "why ", "but "]
-        if any(content.startswith(s) for s in starters):
-            return True
-        
-        return False
+        return self._FOLLOWUP_RE.match(content) is not None
     
     def should_start_conversation(
         self,
@@ -197,12 +332,11 @@ class ResponseDecider:
         Returns:
             Tuple of (decision, reason)
         """
-        if self._is_explicit_trigger(message, bot_user_id):
-            if bot_user_id in [m.id for m in message.mentions]:
-                return True, "explicit_mention"
-            else:
-                return True, "reply_to_bot"
-        
+        if self._mentions_bot(message, bot_user_id):
+            return True, "explicit_mention"
+        if self._is_reply_to_bot(message, bot_user_id):
+            return True, "reply_to_bot"
+
         return False, "no_trigger"
 
     def should_respond(
@@ -226,12 +360,13 @@ class ResponseDecider:
         if self._is_explicit_trigger(message, bot_user_id):
             return True, "explicit_trigger"
         
-        # Tier 2: Recent engagement (maybe respond)
-        seconds_since_bot_spoke = self._seconds_since_bot_spoke(conversation)
-        
-        if seconds_since_bot_spoke is not None and seconds_since_bot_spoke < self.followup_window_seconds:
-            # Bot spoke recently - more likely to respond
-            if self._looks_like_followup(message):
+        # Tier 2: Recent engagement (maybe respond). Check last_bot_response
+        # inline first: if the bot hasn't spoken there's no window to
+        # compute, and the elapsed-time read (which touches the clock) only
+        # runs when it can actually matter.
+        if conversation.last_bot_response is not None:
+            elapsed = (_utc_now() - conversation.last_bot_response).total_seconds()
+            if elapsed < self.followup_window_seconds and self._looks_like_followup(message):
                 return True, "recent_followup"
         
         # Tier 3: Don't respond
@@ -1,12 +1,8 @@
-# ABOUTME: OpenTelemetry instrumentation for Langfuse observability
-# ABOUTME: Configures OTLP exporter and PydanticAI instrumentation
+# ABOUTME: Langfuse observability setup
+# ABOUTME: Enables PydanticAI instrumentation when Langfuse is configured
 
-import base64
 from typing import Optional
-from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
 from pydantic_ai import Agent
 from config import Settings
 from langfuse import get_client
@@ -23,20 +19,23 @@ def is_langfuse_configured(settings: Settings) -> bool:
     Returns:
         True if both public_key and secret_key are set, False otherwise
     """
-    return bool(
-        settings.langfuse_public_key and
-        settings.langfuse_secret_key
-    )
+    # Delegates to the cached property so repeat calls on the settings
+    # singleton don't re-derive the boolean
+    return settings.langfuse_configured
+
+
+# Records which Langfuse target instrumentation was set up for, so
+# repeat calls (test reloads, hot-reloaders) with the same settings are
+# no-ops while a genuine credential change still re-initializes
+_initialized_key: Optional[tuple] = None
 
 
 def initialize_instrumentation(settings: Settings) -> None:
     """
-    Initialize OpenTelemetry instrumentation for Langfuse tracing.
+    Initialize Langfuse tracing via the Langfuse SDK.
 
-    Configures:
-    - OTLP exporter to send traces to Langfuse Cloud
-    - TracerProvider with BatchSpanProcessor
-    - PydanticAI Agent instrumentation
+    The SDK owns the exporter and span processing; this module only
+    verifies credentials and turns on PydanticAI Agent instrumentation.
 
     If Langfuse credentials are not configured, this function does nothing
     (allowing the bot to run without observability).
@@ -44,13 +43,25 @@ def initialize_instrumentation(settings: Settings) -> None:
     Args:
         settings: Application settings containing Langfuse credentials
     """
+    global _initialized_key
+    key = (settings.langfuse_host, settings.langfuse_public_key)
+    if _initialized_key == key:
+        return
+
+    # Cheap env-var check first: a deployment that opted out of Langfuse
+    # shouldn't block startup on auth_check's network round-trip
+    if not is_langfuse_configured(settings):
+        print("Langfuse not configured - skipping instrumentation")
+        return
+
     langfuse = get_client()
     if not langfuse.auth_check():
-        print("Langfuse not configured - skipping instrumentation")
+        print("Langfuse auth check failed - skipping instrumentation")
         return
 
     print("Initializing Langfuse instrumentation...")
 
     Agent.instrument_all()
+    _initialized_key = key
 
     print(f"Langfuse instrumentation initialized")
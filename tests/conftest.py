@@ -0,0 +1,23 @@
+# ABOUTME: Shared pytest fixtures and baseline test environment
+# ABOUTME: Provides required env vars so modules import cleanly under test
+
+import os
+
+import pytest
+
+# bot.py reads settings at import time, so the required credentials must
+# exist before test modules are even collected. setdefault keeps any
+# values the caller exported intact.
+os.environ.setdefault('DISCORD_TOKEN', 'test_token')
+os.environ.setdefault('ANTHROPIC_API_KEY', 'test_key')
+
+
+@pytest.fixture(autouse=True)
+def _base_env(monkeypatch):
+    """Guarantee the required credentials for every test.
+
+    Individual tests still monkeypatch additional vars (and reset the
+    config singleton) when they exercise configuration behavior.
+    """
+    monkeypatch.setenv('DISCORD_TOKEN', 'test_token')
+    monkeypatch.setenv('ANTHROPIC_API_KEY', 'test_key')
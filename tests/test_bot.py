@@ -4,10 +4,31 @@
 import pytest
 from unittest.mock import Mock, AsyncMock, patch, MagicMock
 import discord
+from datetime import datetime, timezone
 from bot import on_message, send_error_message, send_chunked_response, main
 
+# Frozen timestamp for message fixtures; deterministic and avoids
+# per-test clock reads
+_NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
 
-@pytest.fixture
+
+# One stateless no-op async context manager stands in for channel.typing()
+# everywhere, instead of assembling fresh AsyncMock dunder pairs per test
+class _NoopTyping:
+    async def __aenter__(self):
+        return None
+
+    async def __aexit__(self, *args):
+        return None
+
+
+_TYPING = _NoopTyping()
+
+
+# Module-scoped: Mock(spec=discord.Client) introspects the whole class on
+# construction and the tests only read from this object. mock_message
+# stays function-scoped because tests mutate its attributes.
+@pytest.fixture(scope="module")
 def mock_client():
     """Create mocked Discord client."""
     client = Mock(spec=discord.Client)
@@ -32,11 +53,7 @@ def mock_message(mock_client):
     message.channel.guild = Mock()
     message.channel.guild.text_channels = []
 
-    # Create async context manager for typing
-    typing_context = AsyncMock()
-    typing_context.__aenter__ = AsyncMock(return_value=None)
-    typing_context.__aexit__ = AsyncMock(return_value=None)
-    message.channel.typing = Mock(return_value=typing_context)
+    message.channel.typing = Mock(return_value=_TYPING)
 
     message.mentions = []
     message.reference = None
@@ -69,17 +86,14 @@ async def test_ignores_messages_without_mention(mock_client, mock_message):
 @pytest.mark.asyncio
 async def test_responds_to_mention(mock_client, mock_message, monkeypatch):
     """Bot should respond when mentioned with question."""
-    monkeypatch.setenv('DISCORD_TOKEN', 'test_token')
-    monkeypatch.setenv('ANTHROPIC_API_KEY', 'test_key')
 
     # Reset config singleton
     import config
     config._settings = None
 
-    from datetime import datetime, timezone
     mock_message.content = f"<@{mock_client.user.id}> What did we discuss?"
     mock_message.mentions = [mock_client.user]
-    mock_message.created_at = datetime.now(timezone.utc)
+    mock_message.created_at = _NOW
 
     with patch('bot.client', mock_client), \
          patch('bot.run_agent', new_callable=AsyncMock) as mock_agent:
@@ -94,17 +108,14 @@ async def test_responds_to_mention(mock_client, mock_message, monkeypatch):
 @pytest.mark.asyncio
 async def test_handles_empty_question(mock_client, mock_message, monkeypatch):
     """Bot should infer question from recent messages if mention has no text."""
-    monkeypatch.setenv('DISCORD_TOKEN', 'test_token')
-    monkeypatch.setenv('ANTHROPIC_API_KEY', 'test_key')
 
     # Reset config singleton
     import config
     config._settings = None
 
-    from datetime import datetime, timezone
     mock_message.content = f"<@{mock_client.user.id}>"
     mock_message.mentions = [mock_client.user]
-    mock_message.created_at = datetime.now(timezone.utc)
+    mock_message.created_at = _NOW
 
     with patch('bot.client', mock_client), \
          patch('bot.run_agent', new_callable=AsyncMock) as mock_agent:
@@ -124,42 +135,26 @@ async def test_handles_empty_question(mock_client, mock_message, monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_send_chunked_response_single_chunk(monkeypatch):
-    """Should send single message if under limit."""
-    monkeypatch.setenv('DISCORD_TOKEN', 'test_token')
-    monkeypatch.setenv('ANTHROPIC_API_KEY', 'test_key')
-    monkeypatch.setenv('MAX_RESPONSE_LENGTH', '2000')
-
+@pytest.mark.parametrize("text,expected_chunks", [
+    ("Short response", 1),
+    ("A" * 3000, 2),
+    ("A" * 6000, 3),
+])
+async def test_send_chunked_response(text, expected_chunks):
+    """Should send one message per chunk for the 2000-char limit."""
     channel = Mock(spec=discord.TextChannel)
     channel.send = AsyncMock()
 
-    await send_chunked_response(channel, "Short response")
-
-    assert channel.send.call_count == 1
-
-
-@pytest.mark.asyncio
-async def test_send_chunked_response_multiple_chunks(monkeypatch):
-    """Should send multiple messages if over limit."""
-    monkeypatch.setenv('DISCORD_TOKEN', 'test_token')
-    monkeypatch.setenv('ANTHROPIC_API_KEY', 'test_key')
-    monkeypatch.setenv('MAX_RESPONSE_LENGTH', '2000')
-
-    channel = Mock(spec=discord.TextChannel)
-    channel.send = AsyncMock()
-
-    long_text = "A" * 3000
-
-    await send_chunked_response(channel, long_text)
+    # max_length is bound from settings at import time, so an env var
+    # can't influence it here; pass the limit under test explicitly
+    await send_chunked_response(channel, text, max_length=2000)
 
-    assert channel.send.call_count == 2
+    assert channel.send.call_count == expected_chunks
 
 
 @pytest.mark.asyncio
 async def test_send_error_message_to_channel(monkeypatch):
     """Should send error to channel."""
-    monkeypatch.setenv('DISCORD_TOKEN', 'test_token')
-    monkeypatch.setenv('ANTHROPIC_API_KEY', 'test_key')
 
     message = Mock(spec=discord.Message)
     message.channel = Mock(spec=discord.TextChannel)
@@ -174,8 +169,6 @@ async def test_send_error_message_to_channel(monkeypatch):
 @pytest.mark.asyncio
 async def test_send_error_message_to_debug_channel(monkeypatch):
     """Should send detailed error to debug channel if configured."""
-    monkeypatch.setenv('DISCORD_TOKEN', 'test_token')
-    monkeypatch.setenv('ANTHROPIC_API_KEY', 'test_key')
     monkeypatch.setenv('DEBUG_CHANNEL_NAME', 'debug')
 
     # Reset config singleton to pick up new env vars
@@ -2,7 +2,9 @@
 # ABOUTME: Validates ConversationManager, ResponseDecider, and conversation lifecycle
 
 import pytest
+from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
+from typing import Optional
 from unittest.mock import Mock
 import discord
 from conversation import (
@@ -13,6 +15,23 @@ from conversation import (
 from tools import MessageData
 
 
+# Lightweight stand-ins for discord.Message in decider tests.
+# Mock(spec=discord.Message) introspects the whole class per construction;
+# the decider only reads content/mentions/reference off the incoming
+# message. Resolved reply targets stay spec'd mocks because
+# _is_reply_to_bot isinstance-checks them against discord.Message.
+@dataclass(slots=True)
+class FakeRef:
+    resolved: object = None
+
+
+@dataclass(slots=True)
+class FakeMsg:
+    content: str = ""
+    mentions: list = field(default_factory=list)
+    reference: Optional[FakeRef] = None
+
+
 def test_conversation_expires_after_timeout():
     """Conversation should expire after timeout period."""
     manager = ConversationManager(timeout_seconds=60)
@@ -37,22 +56,40 @@ def test_conversation_active_within_timeout():
     assert result.channel_id == 123
 
 
+def test_conversation_expires_after_max_lifetime():
+    """Conversation should expire once max lifetime passes, even if active."""
+    current = [datetime.now(timezone.utc)]
+    manager = ConversationManager(
+        timeout_seconds=60,
+        max_lifetime_seconds=300,
+        clock=lambda: current[0]
+    )
+    manager.start(channel_id=123, initial_messages=[])
+
+    # Stay active past the lifetime cap: recent activity, old start
+    current[0] += timedelta(seconds=301)
+    conv = manager._conversations[123]
+    conv.last_activity = current[0]
+
+    assert manager.get(123) is None
+
+
 def test_message_bumps_timeout():
     """Recording a message should update last_activity timestamp."""
-    manager = ConversationManager(timeout_seconds=60)
+    # Inject a controllable clock so time advances without sleeping
+    current = [datetime.now(timezone.utc)]
+    manager = ConversationManager(timeout_seconds=60, clock=lambda: current[0])
     conv = manager.start(channel_id=123, initial_messages=[])
 
     original_activity = conv.last_activity
 
-    # Wait a moment to ensure timestamp difference
-    import time
-    time.sleep(0.1)
+    current[0] += timedelta(seconds=1)
 
     message = MessageData(
         author="TestUser",
         author_id=456,
         content="Test message",
-        timestamp=datetime.now(timezone.utc),
+        timestamp=current[0],
         is_bot=False
     )
     manager.record_message(123, message)
@@ -138,6 +175,36 @@ def test_record_message_appends_to_messages():
     assert updated_conv.messages[1].content == "Second"
 
 
+def test_record_messages_batch():
+    """Recording a batch should append all messages and add participants."""
+    manager = ConversationManager()
+    conv = manager.start(channel_id=123, initial_messages=[])
+
+    batch = [
+        MessageData(
+            author="User1",
+            author_id=111,
+            content="First",
+            timestamp=datetime.now(timezone.utc),
+            is_bot=False
+        ),
+        MessageData(
+            author="User2",
+            author_id=222,
+            content="Second",
+            timestamp=datetime.now(timezone.utc),
+            is_bot=False
+        )
+    ]
+
+    manager.record_messages(123, batch)
+
+    updated_conv = manager.get(123)
+    assert len(updated_conv.messages) == 2
+    assert updated_conv.messages[0].content == "First"
+    assert updated_conv.participants == {111, 222}
+
+
 def test_record_message_no_conversation():
     """Recording message when no conversation exists should do nothing."""
     manager = ConversationManager()
@@ -172,9 +239,7 @@ def test_response_decider_explicit_mention():
     """ResponseDecider should return True for explicit @mention."""
     decider = ResponseDecider()
     
-    message = Mock(spec=discord.Message)
-    message.mentions = [Mock(id=999)]
-    message.reference = None
+    message = FakeMsg(mentions=[Mock(id=999)])
     
     should_start, reason = decider.should_start_conversation(message, bot_user_id=999)
     
@@ -189,10 +254,7 @@ def test_response_decider_reply_to_bot():
     bot_message = Mock(spec=discord.Message)
     bot_message.author.id = 999
     
-    message = Mock(spec=discord.Message)
-    message.mentions = []
-    message.reference = Mock()
-    message.reference.resolved = bot_message
+    message = FakeMsg(reference=FakeRef(resolved=bot_message))
     
     should_start, reason = decider.should_start_conversation(message, bot_user_id=999)
     
@@ -204,9 +266,7 @@ def test_response_decider_no_trigger():
     """ResponseDecider should return False when no trigger present."""
     decider = ResponseDecider()
     
-    message = Mock(spec=discord.Message)
-    message.mentions = []
-    message.reference = None
+    message = FakeMsg()
     
     should_start, reason = decider.should_start_conversation(message, bot_user_id=999)
     
@@ -221,10 +281,7 @@ def test_response_decider_reply_to_other_user():
     other_message = Mock(spec=discord.Message)
     other_message.author.id = 888
     
-    message = Mock(spec=discord.Message)
-    message.mentions = []
-    message.reference = Mock()
-    message.reference.resolved = other_message
+    message = FakeMsg(reference=FakeRef(resolved=other_message))
     
     should_start, reason = decider.should_start_conversation(message, bot_user_id=999)
     
@@ -236,9 +293,7 @@ def test_should_respond_explicit_trigger_mention():
     """Phase 3: should_respond returns True for explicit @mention."""
     decider = ResponseDecider()
     
-    message = Mock(spec=discord.Message)
-    message.mentions = [Mock(id=999)]
-    message.reference = None
+    message = FakeMsg(mentions=[Mock(id=999)])
     
     conversation = Mock(spec=ChannelConversation)
     
@@ -255,10 +310,7 @@ def test_should_respond_explicit_trigger_reply():
     bot_message = Mock(spec=discord.Message)
     bot_message.author.id = 999
     
-    message = Mock(spec=discord.Message)
-    message.mentions = []
-    message.reference = Mock()
-    message.reference.resolved = bot_message
+    message = FakeMsg(reference=FakeRef(resolved=bot_message))
     
     conversation = Mock(spec=ChannelConversation)
     
@@ -272,10 +324,7 @@ def test_should_respond_recent_followup():
     """Phase 3: should_respond returns True for followup question after recent bot response."""
     decider = ResponseDecider(followup_window_seconds=60)
     
-    message = Mock(spec=discord.Message)
-    message.mentions = []
-    message.reference = None
-    message.content = "Why is that?"
+    message = FakeMsg(content="Why is that?")
     
     conversation = ChannelConversation(
         channel_id=123,
@@ -294,10 +343,7 @@ def test_should_respond_no_response_old_bot_message():
     """Phase 3: should_respond returns False when bot spoke too long ago."""
     decider = ResponseDecider(followup_window_seconds=60)
     
-    message = Mock(spec=discord.Message)
-    message.mentions = []
-    message.reference = None
-    message.content = "Why is that?"
+    message = FakeMsg(content="Why is that?")
     
     conversation = ChannelConversation(
         channel_id=123,
@@ -316,10 +362,7 @@ def test_should_respond_no_response_not_followup():
     """Phase 3: should_respond returns False when message doesn't look like followup."""
     decider = ResponseDecider(followup_window_seconds=60)
     
-    message = Mock(spec=discord.Message)
-    message.mentions = []
-    message.reference = None
-    message.content = "This is a long message that doesn't look like a followup question at all"
+    message = FakeMsg(content="This is a long message that doesn't look like a followup question at all")
     
     conversation = ChannelConversation(
         channel_id=123,
@@ -338,10 +381,7 @@ def test_should_respond_no_response_no_bot_history():
     """Phase 3: should_respond returns False when bot hasn't spoken yet."""
     decider = ResponseDecider(followup_window_seconds=60)
     
-    message = Mock(spec=discord.Message)
-    message.mentions = []
-    message.reference = None
-    message.content = "Why is that?"
+    message = FakeMsg(content="Why is that?")
     
     conversation = ChannelConversation(
         channel_id=123,
@@ -360,45 +400,38 @@ def test_looks_like_followup_short_question():
     """_looks_like_followup returns True for short messages with question marks."""
     decider = ResponseDecider()
     
-    message = Mock(spec=discord.Message)
-    message.content = "Why?"
+    message = FakeMsg(content="Why?")
     
     assert decider._looks_like_followup(message) is True
 
 
-def test_looks_like_followup_continuation_word():
+@pytest.fixture(scope="module")
+def decider():
+    """Shared stateless decider for the parametrized followup cases."""
+    return ResponseDecider()
+
+
+@pytest.mark.parametrize("content", [
+    "and what about that?",
+    "also how does it work?",
+    "what about the other one?",
+    "how about this?",
+    "why is that?",
+    "but what if?"
+])
+def test_looks_like_followup_continuation_word(decider, content):
     """_looks_like_followup returns True for messages starting with continuation words."""
-    decider = ResponseDecider()
-    
-    test_cases = [
-        "and what about that?",
-        "also how does it work?",
-        "what about the other one?",
-        "how about this?",
-        "why is that?",
-        "but what if?"
-    ]
-    
-    for content in test_cases:
-        message = Mock(spec=discord.Message)
-        message.content = content
-        assert decider._looks_like_followup(message) is True, f"Failed for: {content}"
+    assert decider._looks_like_followup(FakeMsg(content=content)) is True
 
 
-def test_looks_like_followup_not_followup():
+@pytest.mark.parametrize("content", [
+    "This is a long message that doesn't look like a followup",
+    "Just a regular statement",
+    "No question mark here"
+])
+def test_looks_like_followup_not_followup(decider, content):
     """_looks_like_followup returns False for messages that don't look like followups."""
-    decider = ResponseDecider()
-    
-    test_cases = [
-        "This is a long message that doesn't look like a followup",
-        "Just a regular statement",
-        "No question mark here"
-    ]
-    
-    for content in test_cases:
-        message = Mock(spec=discord.Message)
-        message.content = content
-        assert decider._looks_like_followup(message) is False, f"Failed for: {content}"
+    assert decider._looks_like_followup(FakeMsg(content=content)) is False
 
 
 def test_seconds_since_bot_spoke():
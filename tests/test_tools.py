@@ -2,12 +2,40 @@
 # ABOUTME: Uses mocked Discord API to test tool functionality
 
 import pytest
+from dataclasses import dataclass
 from datetime import datetime, timedelta, UTC
 from unittest.mock import AsyncMock, Mock, MagicMock
 import discord
 from tools import fetch_messages_tool, FetchMessagesParams, MessageData
 
 
+# Lightweight stand-ins for history entries: the tool only reads plain
+# attributes off each message, so spec'd Mocks (which introspect the
+# discord.Message class on construction) are needless overhead here.
+# The channel and client fixtures stay spec'd Mocks because the tool
+# isinstance-checks the channel type.
+@dataclass(slots=True)
+class FakeAuthor:
+    display_name: str
+    id: int
+    bot: bool = False
+
+
+@dataclass(slots=True)
+class FakeHistoryMessage:
+    author: FakeAuthor
+    content: str
+    created_at: datetime
+
+
+def make_history(messages):
+    """Build a channel.history() stand-in yielding newest-first."""
+    async def _history():
+        for msg in reversed(messages):
+            yield msg
+    return _history()
+
+
 @pytest.fixture
 def mock_discord_client():
     """Create a mocked Discord client."""
@@ -25,34 +53,23 @@ def mock_text_channel():
 
 @pytest.fixture
 def mock_messages():
-    """Create mock Discord messages."""
-    messages = []
+    """Create fake Discord messages."""
     base_time = datetime.now(UTC) - timedelta(hours=2)
-
-    for i in range(5):
-        msg = Mock(spec=discord.Message)
-        msg.author = Mock()
-        msg.author.display_name = f"User{i}"
-        msg.author.id = 1000 + i
-        msg.author.bot = False
-        msg.content = f"Test message {i}"
-        msg.created_at = base_time + timedelta(minutes=i*10)
-        messages.append(msg)
-
-    return messages
+    return [
+        FakeHistoryMessage(
+            author=FakeAuthor(display_name=f"User{i}", id=1000 + i),
+            content=f"Test message {i}",
+            created_at=base_time + timedelta(minutes=i * 10),
+        )
+        for i in range(5)
+    ]
 
 
 @pytest.mark.asyncio
 async def test_fetch_messages_success(mock_discord_client, mock_text_channel, mock_messages):
     """Tool should successfully fetch messages from channel."""
     mock_discord_client.get_channel.return_value = mock_text_channel
-
-    # Mock the async iteration
-    async def async_generator():
-        for msg in reversed(mock_messages):  # history returns newest first
-            yield msg
-
-    mock_text_channel.history.return_value = async_generator()
+    mock_text_channel.history.return_value = make_history(mock_messages)
 
     params = FetchMessagesParams(channel_id=123456789, hours_back=24, limit=100)
     result = await fetch_messages_tool(params, mock_discord_client)
@@ -93,24 +110,21 @@ async def test_fetch_messages_not_text_channel(mock_discord_client):
 @pytest.mark.asyncio
 async def test_fetch_messages_filters_bots(mock_discord_client, mock_text_channel):
     """Tool should filter out bot messages."""
-    messages = []
-    for i in range(3):
-        msg = Mock(spec=discord.Message)
-        msg.author = Mock()
-        msg.author.display_name = f"User{i}"
-        msg.author.id = 1000 + i
-        msg.author.bot = i == 1  # Middle message is from bot
-        msg.content = f"Message {i}"
-        msg.created_at = datetime.now(UTC)
-        messages.append(msg)
+    messages = [
+        FakeHistoryMessage(
+            author=FakeAuthor(
+                display_name=f"User{i}",
+                id=1000 + i,
+                bot=i == 1,  # Middle message is from bot
+            ),
+            content=f"Message {i}",
+            created_at=datetime.now(UTC),
+        )
+        for i in range(3)
+    ]
 
     mock_discord_client.get_channel.return_value = mock_text_channel
-
-    async def async_generator():
-        for msg in messages:
-            yield msg
-
-    mock_text_channel.history.return_value = async_generator()
+    mock_text_channel.history.return_value = make_history(messages)
 
     params = FetchMessagesParams(channel_id=123456, hours_back=24, limit=100)
     result = await fetch_messages_tool(params, mock_discord_client)
@@ -132,3 +146,22 @@ def test_fetch_messages_params_validation():
     # Invalid hours (too high)
     with pytest.raises(Exception):
         FetchMessagesParams(channel_id=123, hours_back=200)
+
+
+@pytest.mark.asyncio
+async def test_fetch_messages_uses_short_ttl_cache(mock_discord_client, mock_text_channel, mock_messages):
+    """Repeated fetches with identical params should hit the cache, not Discord."""
+    import tools
+    tools._fetch_cache = None
+
+    mock_discord_client.get_channel.return_value = mock_text_channel
+    mock_text_channel.history.return_value = make_history(mock_messages)
+
+    params = FetchMessagesParams(channel_id=555000111, hours_back=24, limit=100)
+    first = await fetch_messages_tool(params, mock_discord_client)
+    second = await fetch_messages_tool(params, mock_discord_client)
+
+    assert mock_text_channel.history.call_count == 1
+    assert first == second
+    # Cached result should be a copy, safe for callers to mutate
+    assert first is not second
@@ -63,6 +63,18 @@ def test_chunk_message_force_split():
     assert len(chunks[1]) == 1000
 
 
+def test_chunk_message_ignores_trailing_whitespace():
+    """Trailing whitespace shouldn't force an extra split of the final chunk."""
+    tail = "B" * 1990 + ". " + "C" * 5
+    text = "A" * 2000 + " " + tail + " " * 100
+
+    chunks = chunk_message(text, max_length=2000)
+
+    # The tail fits the cap once trailing whitespace is discounted, so it
+    # must come through whole rather than splitting at its sentence
+    assert chunks == ["A" * 2000, tail]
+
+
 def test_get_time_window():
     """Time window should calculate correct past datetime."""
     from datetime import UTC
@@ -1,9 +1,11 @@
 # ABOUTME: Tool definitions for pydanticai agent
 # ABOUTME: Provides message fetching capability from Discord channels
 
+from collections import deque
 from datetime import datetime
 from typing import List, Optional
 import discord
+from cachetools import TTLCache
 from pydantic import BaseModel, Field
 from utils import get_time_window
 from config import get_settings
@@ -19,8 +21,10 @@ class MessageData(BaseModel):
 
     def __str__(self) -> str:
         """Format message for display to AI."""
-        time_str = self.timestamp.strftime("%Y-%m-%d %H:%M:%S UTC")
-        return f"[{time_str}] {self.author}: {self.content}"
+        # isoformat is a C fast path; slicing to 19 chars drops the
+        # +00:00 offset so the output matches the old strftime format
+        time_str = self.timestamp.isoformat(sep=" ", timespec="seconds")[:19]
+        return f"[{time_str} UTC] {self.author}: {self.content}"
 
 
 class FetchMessagesParams(BaseModel):
@@ -40,6 +44,19 @@ class FetchMessagesParams(BaseModel):
     )
 
 
+# Lazy singleton cache for fetched message history (TTL from settings)
+_fetch_cache = None
+
+
+def _get_fetch_cache() -> TTLCache:
+    """Get or create the short-TTL cache for fetched messages."""
+    global _fetch_cache
+    if _fetch_cache is None:
+        settings = get_settings()
+        _fetch_cache = TTLCache(maxsize=256, ttl=settings.message_fetch_cache_ttl)
+    return _fetch_cache
+
+
 async def fetch_messages_tool(
     params: FetchMessagesParams,
     client: discord.Client
@@ -48,6 +65,8 @@ async def fetch_messages_tool(
     Fetch messages from a Discord channel within a time window.
 
     This tool is called by the AI agent to retrieve message history.
+    Results are cached briefly per (channel, window, limit) so back-to-back
+    messages in an active conversation don't repeat the same REST call.
 
     Args:
         params: Parameters including channel_id, hours_back, limit
@@ -59,6 +78,13 @@ async def fetch_messages_tool(
     Raises:
         ValueError: If channel not found or not accessible
     """
+    cache = _get_fetch_cache()
+    cache_key = (params.channel_id, params.hours_back, params.limit)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        # Return a copy so callers can append without corrupting the cache
+        return list(cached)
+
     channel = client.get_channel(params.channel_id)
 
     if not channel:
@@ -70,9 +96,14 @@ async def fetch_messages_tool(
     # Calculate time window
     after_time = get_time_window(params.hours_back)
 
-    # Fetch messages
+    # Fetch messages newest-first, prepending so the deque ends up in
+    # chronological order without a separate reversal pass
     limit = params.limit or get_settings().default_message_limit
-    messages = []
+    messages: deque[MessageData] = deque()
+
+    # Bind the hot names once; the loop body runs per fetched message
+    prepend = messages.appendleft
+    construct = MessageData.model_construct
 
     async for message in channel.history(
         limit=limit,
@@ -80,14 +111,17 @@ async def fetch_messages_tool(
         oldest_first=False
     ):
         # Skip bot messages to reduce noise
-        if not message.author.bot:
-            messages.append(MessageData(
-                author=message.author.display_name,
-                author_id=message.author.id,
+        author = message.author
+        if not author.bot:
+            # Fields come straight from the Discord message; skip validation
+            prepend(construct(
+                author=author.display_name,
+                author_id=author.id,
                 timestamp=message.created_at,
                 content=message.content,
-                is_bot=message.author.bot
+                is_bot=author.bot
             ))
 
-    # Return in chronological order (oldest first)
-    return list(reversed(messages))
+    result = list(messages)
+    cache[cache_key] = result
+    return list(result)
@@ -1,9 +1,14 @@
 # ABOUTME: Utility functions for message processing
 # ABOUTME: Handles message chunking and time window calculations
 
-from datetime import datetime, timedelta
+import re
+from datetime import UTC, datetime, timedelta
 from typing import List
 
+# Matches both <@id> and <@!id> mention forms, swallowing the whitespace
+# that typically follows ("@bot what is X?") in the same pass
+MENTION_RE = re.compile(r'<@!?\d+>\s*')
+
 
 def chunk_message(text: str, max_length: int = 2000) -> List[str]:
     """
@@ -19,37 +24,50 @@ def chunk_message(text: str, max_length: int = 2000) -> List[str]:
     Returns:
         List of text chunks, each under max_length
     """
-    if len(text) <= max_length:
+    n = len(text)
+    if n <= max_length:
         return [text]
 
+    # Work with offsets into the original string: rfind takes start/end
+    # bounds, so each boundary probe scans in place instead of slicing a
+    # max_length-sized window copy per iteration. Trailing whitespace is
+    # stripped from every chunk, so it must not count toward the final
+    # chunk's length either.
+    n = len(text.rstrip())
     chunks = []
-    remaining = text
+    offset = 0
 
-    while remaining:
-        if len(remaining) <= max_length:
-            chunks.append(remaining)
+    while offset < n:
+        if n - offset <= max_length:
+            chunks.append(text[offset:n].strip())
             break
 
+        end = offset + max_length
+
         # Try to split at paragraph boundary
-        chunk = remaining[:max_length]
-        split_pos = chunk.rfind('\n\n')
+        split_pos = text.rfind('\n\n', offset, end)
 
         # Try sentence boundary if no paragraph
         if split_pos == -1:
-            split_pos = chunk.rfind('. ')
+            split_pos = text.rfind('. ', offset, end)
             if split_pos != -1:
                 split_pos += 1  # Include the period
 
         # Try any whitespace if no sentence
         if split_pos == -1:
-            split_pos = chunk.rfind(' ')
+            split_pos = text.rfind(' ', offset, end)
 
         # Force split if no good boundary found
         if split_pos == -1:
-            split_pos = max_length
+            split_pos = end
+
+        chunks.append(text[offset:split_pos].strip())
 
-        chunks.append(remaining[:split_pos].strip())
-        remaining = remaining[split_pos:].strip()
+        # Advance past the boundary, skipping whitespace in place rather
+        # than allocating a stripped copy of the whole remainder
+        offset = split_pos
+        while offset < n and text[offset].isspace():
+            offset += 1
 
     return chunks
 
@@ -64,5 +82,4 @@ def get_time_window(hours: int) -> datetime:
     Returns:
         Datetime representing the start of the time window
     """
-    from datetime import UTC
     return datetime.now(UTC) - timedelta(hours=hours)